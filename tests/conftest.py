@@ -13,6 +13,7 @@ integration tests will be recorded to JSON files, which are played back during
 unit testing. The --record flag implies --integration.
 """
 
+import functools
 import json
 import os
 
@@ -32,6 +33,17 @@ def logdir(request):
     return os.path.join("tests", "recordings", request.node.name[5:][:-3])
 
 
+@pytest.fixture(scope="session")
+def _serial_handler():
+    """Return a SerialHandler instance which is shared by all integration tests.
+
+    Connecting to the PSLab is slow, so the connection is only made once.
+    """
+    H = serial_handler.SerialHandler()
+    yield H
+    H.disconnect()
+
+
 @pytest.fixture
 def handler(monkeypatch, request, logdir):
     """Return a SerialHandler instance.
@@ -43,10 +55,11 @@ def handler(monkeypatch, request, logdir):
     logfile = os.path.join(logdir, request.node.name + ".json")
 
     if integration:
-        H = serial_handler.SerialHandler()
+        H = request.getfixturevalue("_serial_handler")
+        H._log = b""
+        H._logging = False
     else:
-        tx, rx = json.load(open(logfile, "r"))
-        traffic = ((bytes(t), bytes(r)) for t, r in zip(tx, rx))
+        traffic = iter(load_recording(logfile))
         monkeypatch.setattr(serial_handler, "RECORDED_TRAFFIC", traffic)
         H = serial_handler.MockHandler()
 
@@ -57,24 +70,38 @@ def handler(monkeypatch, request, logdir):
         record_traffic(log, logfile)
 
 
+@functools.lru_cache(maxsize=None)
+def load_recording(logfile: str) -> tuple:
+    """Load recorded serial traffic from a JSON file.
+
+    Recordings are cached, so each file is only read and parsed once per session.
+    """
+    with open(logfile, "r") as f:
+        tx, rx = json.load(f)
+
+    return tuple((bytes(t), bytes(r)) for t, r in zip(tx, rx))
+
+
 def record_traffic(log: list, logfile: str):
     """Record serial traffic to a JSON file.
 
     The file name is the test name + .json.
     """
     tx = []
-    rx = []
+    rx_chunks = []
 
     for b in log:
         direction = b[:2]
         data = b[2:]
         if direction == b"TX":
             tx.append(list(data))
-            rx.append([])
+            rx_chunks.append([])
         elif direction == b"RX":
-            rx[-1] += list(data)
+            rx_chunks[-1].append(data)
         else:
             raise ValueError(f"Unknown direction: {direction}")
 
-    print([tx, rx])
-    json.dump([tx, rx], open(logfile, "w"))
+    rx = [list(b"".join(chunks)) for chunks in rx_chunks]
+
+    with open(logfile, "w") as f:
+        json.dump([tx, rx], f, separators=(",", ":"))
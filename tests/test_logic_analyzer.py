@@ -27,37 +27,49 @@ LOW_FREQUENCY = 100
 LOWER_FREQUENCY = 10
 MICROSECONDS = 1e6
 TWO_CLOCK_CYCLES = 2 * CP.CLOCK_RATE ** -1 * MICROSECONDS
+# Tests which need a PWM frequency other than FREQUENCY.
+PWM_FREQUENCIES = {
+    "test_capture_four_low_frequency": LOW_FREQUENCY,
+    "test_capture_four_lower_frequency": LOW_FREQUENCY,
+    "test_capture_four_lowest_frequency": LOW_FREQUENCY,
+    "test_capture_four_too_low_frequency": LOWER_FREQUENCY,
+    "test_capture_timeout": LOW_FREQUENCY,
+    "test_get_states": LOW_FREQUENCY,
+}
+
+
+@pytest.fixture(scope="module")
+def pwm_frequency():
+    """Return a cache of the frequency currently output on SQ1-SQ4."""
+    return {"frequency": None}
 
 
 @pytest.fixture
-def la(handler, request):
+def la(handler, request, pwm_frequency):
     """Return a LogicAnalyzer instance.
 
     In integration test mode, this function also enables the PWM output.
     """
     if not isinstance(handler, MockHandler):
-        pwm = PWMGenerator(handler)
-        enable_pwm(pwm, request.node.name)
+        frequency = get_frequency(request.node.name)
+
+        # Reconfiguring the PWM output is slow; skip it if already enabled.
+        if frequency != pwm_frequency["frequency"]:
+            pwm = PWMGenerator(handler)
+            enable_pwm(pwm, frequency)
+            pwm_frequency["frequency"] = frequency
+
         handler._logging = True
     return LogicAnalyzer(handler)
 
 
-def enable_pwm(pwm: PWMGenerator, test_name: str):
-    """Enable PWM output for integration testing."""
-    low_frequency_tests = (
-        "test_capture_four_low_frequency",
-        "test_capture_four_lower_frequency",
-        "test_capture_four_lowest_frequency",
-        "test_capture_timeout",
-        "test_get_states",
-    )
-    if test_name in low_frequency_tests:
-        frequency = LOW_FREQUENCY
-    elif test_name == "test_capture_four_too_low_frequency":
-        frequency = LOWER_FREQUENCY
-    else:
-        frequency = FREQUENCY
+def get_frequency(test_name: str) -> float:
+    """Return the PWM frequency used by a test."""
+    return PWM_FREQUENCIES.get(test_name, FREQUENCY)
 
+
+def enable_pwm(pwm: PWMGenerator, frequency: float):
+    """Enable PWM output for integration testing."""
     pwm.generate(
         ["SQ1", "SQ2", "SQ3", "SQ4"],
         frequency,
@@ -66,6 +78,26 @@ def enable_pwm(pwm: PWMGenerator, test_name: str):
     )
 
 
+def wait_for_capture(la: LogicAnalyzer, events: int, timeout: float = 1):
+    """Wait until the logic analyzer has captured the requested number of events.
+
+    In playback mode there is nothing to wait for, so this returns immediately.
+    """
+    if isinstance(la._device, MockHandler):
+        return
+
+    # Polling traffic varies between runs and should not be recorded.
+    la._device._logging = False
+    start_time = time.time()
+
+    while time.time() - start_time < timeout:
+        if la.get_progress() >= events:
+            break
+        time.sleep(1e-3)
+
+    la._device._logging = True
+
+
 def test_capture_one_channel(la):
     t = la.capture(1, EVENTS)
     assert len(t[0]) == EVENTS
@@ -87,7 +119,7 @@ def test_capture_four_low_frequency(la):
     # When capturing every edge, the accuracy seems to depend on
     # the PWM prescaler as well as the logic analyzer prescaler.
     pwm_abstol = TWO_CLOCK_CYCLES * LogicAnalyzer._PRESCALERS[2]
-    assert np.array(9 * [e2e_time * MICROSECONDS]) == pytest.approx(
+    assert np.full(9, e2e_time * MICROSECONDS) == pytest.approx(
         np.diff(t1), abs=TWO_CLOCK_CYCLES * LogicAnalyzer._PRESCALERS[1] + pwm_abstol
     )
 
@@ -95,7 +127,7 @@ def test_capture_four_low_frequency(la):
 def test_capture_four_lower_frequency(la):
     e2e_time = LOW_FREQUENCY ** -1
     t1 = la.capture(4, 10, modes=4 * ["rising"], e2e_time=e2e_time)[0]
-    assert np.array(9 * [e2e_time * MICROSECONDS]) == pytest.approx(
+    assert np.full(9, e2e_time * MICROSECONDS) == pytest.approx(
         np.diff(t1), abs=TWO_CLOCK_CYCLES * LogicAnalyzer._PRESCALERS[2]
     )
 
@@ -105,7 +137,7 @@ def test_capture_four_lowest_frequency(la):
     t1 = la.capture(4, 10, modes=4 * ["sixteen rising"], e2e_time=e2e_time, timeout=2)[
         0
     ]
-    assert np.array(9 * [e2e_time * MICROSECONDS]) == pytest.approx(
+    assert np.full(9, e2e_time * MICROSECONDS) == pytest.approx(
         np.diff(t1), abs=TWO_CLOCK_CYCLES * LogicAnalyzer._PRESCALERS[3]
     )
 
@@ -118,7 +150,7 @@ def test_capture_four_too_low_frequency(la):
 
 def test_capture_nonblocking(la):
     la.capture(1, EVENTS, block=False)
-    time.sleep(EVENTS * FREQUENCY ** -1)
+    wait_for_capture(la, EVENTS)
     t = la.fetch_data()
     assert len(t[0]) >= EVENTS
 
@@ -182,48 +214,23 @@ def test_measure_interval(la):
     assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
 
 
-def test_measure_interval_same_channel(la):
-    la.configure_trigger("LA1", "falling")
-    interval = la.measure_interval(
-        channels=["LA1", "LA1"], modes=["rising", "falling"], timeout=0.1
-    )
-    expected_interval = FREQUENCY ** -1 * DUTY_CYCLE * MICROSECONDS
-    assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
-
-
-def test_measure_interval_same_channel_any(la):
-    la.configure_trigger("LA1", "falling")
-    interval = la.measure_interval(
-        channels=["LA1", "LA1"], modes=["any", "any"], timeout=0.1
-    )
-    expected_interval = FREQUENCY ** -1 * DUTY_CYCLE * MICROSECONDS
-    assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
-
-
-def test_measure_interval_same_channel_four_rising(la):
-    la.configure_trigger("LA1", "falling")
-    interval = la.measure_interval(
-        channels=["LA1", "LA1"], modes=["rising", "four rising"], timeout=0.1
-    )
-    expected_interval = FREQUENCY ** -1 * 3 * MICROSECONDS
-    assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
-
-
-def test_measure_interval_same_channel_sixteen_rising(la):
-    la.configure_trigger("LA1", "falling")
-    interval = la.measure_interval(
-        channels=["LA1", "LA1"], modes=["rising", "sixteen rising"], timeout=0.1
-    )
-    expected_interval = FREQUENCY ** -1 * 15 * MICROSECONDS
-    assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
-
-
-def test_measure_interval_same_channel_same_event(la):
+@pytest.mark.parametrize(
+    "channel,modes,periods",
+    [
+        ("LA1", ["rising", "falling"], DUTY_CYCLE),
+        ("LA1", ["any", "any"], DUTY_CYCLE),
+        ("LA1", ["rising", "four rising"], 3),
+        ("LA1", ["rising", "sixteen rising"], 15),
+        ("LA3", ["rising", "rising"], 1),
+    ],
+    ids=["rising_falling", "any", "four_rising", "sixteen_rising", "same_event"],
+)
+def test_measure_interval_same_channel(la, channel, modes, periods):
     la.configure_trigger("LA1", "falling")
     interval = la.measure_interval(
-        channels=["LA3", "LA3"], modes=["rising", "rising"], timeout=0.1
+        channels=[channel, channel], modes=modes, timeout=0.1
     )
-    expected_interval = FREQUENCY ** -1 * MICROSECONDS
+    expected_interval = FREQUENCY ** -1 * periods * MICROSECONDS
     assert expected_interval == pytest.approx(interval, abs=TWO_CLOCK_CYCLES)
 
 
@@ -235,30 +242,23 @@ def test_measure_duty_cycle(la):
     )
 
 
-def test_get_xy_rising_trigger(la):
-    la.configure_trigger("LA1", "rising")
-    t = la.capture(1, 100)
-    _, y = la.get_xy(t)
-    assert y[0]
-
-
-def test_get_xy_falling_trigger(la):
-    la.configure_trigger("LA1", "falling")
+@pytest.mark.parametrize(
+    "trigger_mode,state", [("rising", 1), ("falling", 0)], ids=["rising", "falling"]
+)
+def test_get_xy_trigger(la, trigger_mode, state):
+    la.configure_trigger("LA1", trigger_mode)
     t = la.capture(1, 100)
     _, y = la.get_xy(t)
-    assert not y[0]
-
-
-def test_get_xy_rising_capture(la):
-    t = la.capture(1, 100, modes=["rising"])
-    _, y = la.get_xy(t)
-    assert sum(y) == 100
+    assert y[0] == state
 
 
-def test_get_xy_falling_capture(la):
-    t = la.capture(1, 100, modes=["falling"])
+@pytest.mark.parametrize(
+    "mode,state", [("rising", 1), ("falling", 0)], ids=["rising", "falling"]
+)
+def test_get_xy_capture(la, mode, state):
+    t = la.capture(1, 100, modes=[mode])
     _, y = la.get_xy(t)
-    assert sum(~y) == 100
+    assert sum(y == state) == 100
 
 
 def test_stop(la):